@@ -1,13 +1,15 @@
 import streamlit as st
 import pandas as pd
-from pathlib import Path
 import matplotlib.pyplot as plt
 
 from utils import (
+    DATA_DIR,
+    _DEFAULT_COLS,
     load_all_countries,
     generate_summary,
-    plot_country_ranking,
-    plot_metric_boxplot,
+    full_summary,
+    rendered_ranking_png,
+    rendered_boxplot_png,
     run_statistical_tests,
 )
 
@@ -17,8 +19,7 @@ st.title("🌍 Cross-Country Comparison")
 st.caption("Analyze and compare solar energy metrics across multiple countries.")
 
 # Load all cleaned data
-DATA_DIR = Path("./data").resolve()
-df_all = load_all_countries(DATA_DIR)
+df_all = load_all_countries(DATA_DIR, _DEFAULT_COLS)
 
 if df_all.empty:
     st.warning("No cleaned data found in './data'. Ensure *_clean.csv files exist.")
@@ -30,18 +31,8 @@ metric = st.selectbox("📊 Select metric to compare:", options=numeric_columns,
 
 # Summary Table
 st.subheader(f"📋 {metric} Summary Statistics by Country")
-summary_table = (
-    df_all.groupby("Country")[metric]
-    .agg(
-        Count="count",
-        Mean="mean",
-        StdDev="std",
-        Min="min",
-        Max="max"
-    )
-    .round(2)
-    .sort_values("Mean", ascending=False)
-)
+summary = full_summary(df_all)
+summary_table = summary.xs(metric, axis=1, level=0).sort_values("Mean", ascending=False)
 st.dataframe(summary_table)
 
 # Layout for Visuals
@@ -49,13 +40,11 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.markdown(f"##### 📈 {metric} Mean Ranking by Country")
-    fig = plot_country_ranking(df_all, metric)
-    st.pyplot(fig)
+    st.image(rendered_ranking_png(df_all, metric))
 
 with col2:
     st.markdown(f"##### 📦 {metric} Distribution by Country")
-    fig = plot_metric_boxplot(df_all, metric)
-    st.pyplot(fig)
+    st.image(rendered_boxplot_png(df_all, metric))
     
 # Statistical Tests
 st.subheader("🧪 Statistical Comparison")
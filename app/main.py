@@ -1,24 +1,21 @@
 import streamlit as st
+import numpy as np
 import seaborn as sns
-import matplotlib.pyplot as plt
-from pathlib import Path
+from matplotlib.figure import Figure
 
-from utils import load_clean_data, get_available_countries
+from utils import DATA_DIR, _DEFAULT_COLS, load_clean_data, get_available_countries, resample_series
 
 # Page setup
 st.set_page_config(page_title="☀️ Solar Data Discovery Dashboard", layout="wide")
 st.title("☀️ Solar Data Discovery Dashboard")
 st.caption("Explore solar energy metrics for individual countries.")
 
-# Constants
-DATA_DIR = Path("./data").resolve()
-
 # Sidebar: Country selector
 available_countries = get_available_countries(DATA_DIR)
 selected_country = st.sidebar.selectbox("Select a country", available_countries if available_countries else [None])
 
 if selected_country:
-    df = load_clean_data(DATA_DIR, selected_country)
+    df = load_clean_data(DATA_DIR, selected_country, _DEFAULT_COLS)
 
     if df.empty:
         st.warning(f"No data available for {selected_country}.")
@@ -31,25 +28,28 @@ if selected_country:
     col1, col2 = st.columns([1, 2])
     with col1:
         st.markdown("#### GHI Distribution")
-        fig, ax = plt.subplots(figsize=(6, 4))
+        fig = Figure(figsize=(6, 4))
+        ax = fig.subplots()
         sns.boxplot(data=df, y="GHI", ax=ax)
-        st.pyplot(fig)
+        st.pyplot(fig, clear_figure=True)
 
     with col2:
         st.markdown("#### Key Metrics")
         kpi_cols = st.columns(2)
-        kpi_cols[0].metric("Avg GHI", f"{df['GHI'].mean():.1f} W/m²")
-        kpi_cols[1].metric("Avg DNI", f"{df['DNI'].mean():.1f} W/m²")
+        avg_ghi, avg_dni = np.nanmean(df[["GHI", "DNI"]].to_numpy(dtype=np.float64), axis=0)
+        kpi_cols[0].metric("Avg GHI", f"{avg_ghi:.1f} W/m²")
+        kpi_cols[1].metric("Avg DNI", f"{avg_dni:.1f} W/m²")
 
     # Monthly Trend (if Month column exists)
     if "Month" in df.columns:
         st.subheader("📆 Monthly GHI Trend")
         monthly = df.groupby("Month")["GHI"].mean().reset_index()
-        fig, ax = plt.subplots()
+        fig = Figure()
+        ax = fig.subplots()
         sns.barplot(data=monthly, x="Month", y="GHI", palette="viridis", ax=ax)
         ax.set_ylabel("Avg GHI")
         ax.set_title("Monthly Average GHI")
-        st.pyplot(fig)
+        st.pyplot(fig, clear_figure=True)
 
     # Scatter Plots
     st.subheader("🔍 Feature Relationships")
@@ -57,26 +57,29 @@ if selected_country:
 
     with scatter_col[0]:
         st.markdown("##### WS vs GHI")
-        fig, ax = plt.subplots()
+        fig = Figure()
+        ax = fig.subplots()
         sns.scatterplot(data=df, x="WS", y="GHI", alpha=0.3, ax=ax)
-        st.pyplot(fig)
+        st.pyplot(fig, clear_figure=True)
 
     with scatter_col[1]:
         st.markdown("##### RH vs Tamb")
-        fig, ax = plt.subplots()
+        fig = Figure()
+        ax = fig.subplots()
         sns.scatterplot(data=df, x="RH", y="Tamb", alpha=0.3, ax=ax)
-        st.pyplot(fig)
+        st.pyplot(fig, clear_figure=True)
 
     # Time Series Plot
     if "Timestamp" in df.columns:
         st.subheader("📈 GHI Over Time")
-        fig, ax = plt.subplots(figsize=(10, 4))
-        df_sorted = df.sort_values("Timestamp")
-        ax.plot(df_sorted["Timestamp"], df_sorted["GHI"], alpha=0.6)
+        fig = Figure(figsize=(10, 4))
+        ax = fig.subplots()
+        series = resample_series(df, selected_country, "GHI", "30min")
+        ax.plot(series.index, series.values, alpha=0.6)
         ax.set_xlabel("Time")
         ax.set_ylabel("GHI (W/m²)")
         ax.set_title("GHI Time Series")
-        st.pyplot(fig)
+        st.pyplot(fig, clear_figure=True)
 
 else:
     st.warning("Please select a valid country from the dropdown.")
\ No newline at end of file
@@ -1,39 +1,155 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 from scipy.stats import f_oneway, kruskal
-
-
+import pyarrow.parquet as pq
+import streamlit as st
+
+# Resolved once at import so every cached loader sees the same cache key
+DATA_DIR = Path("./data").resolve()
+# Combined dataset written by scripts/build_parquet.py
+PARQUET_FILE = "all_countries.parquet"
+# Columns the dashboard pages actually use
+_DEFAULT_COLS = ["Timestamp", "GHI", "DNI", "DHI", "WS", "RH", "Tamb", "Month"]
+# Low-cardinality columns stored as category, sensor columns downcast to float32
+CATEGORICAL_COLS = ["Country", "Cleaning"]
+_FLOAT32_COLS = ["GHI", "DNI", "DHI", "ModA", "ModB", "WS", "WSgust"]
+
+
+def _country_files(data_dir: Path) -> dict:
+    # A <country>_clean.parquet from scripts/clean_all.py takes precedence over the CSV
+    files = {f.name.replace("_clean.csv", ""): f for f in data_dir.glob("*_clean.csv")}
+    files.update({f.name.replace("_clean.parquet", ""): f for f in data_dir.glob("*_clean.parquet")})
+    return dict(sorted(files.items()))
+
+@st.cache_data(ttl=300)
 def get_available_countries(data_dir: Path) -> list:
-    csv_files = list(data_dir.glob("*_clean.csv"))
-    return [f.name.replace("_clean.csv", "") for f in csv_files]
-
-def load_clean_data(data_dir: Path, country: str) -> pd.DataFrame:
-    file_path = data_dir / f"{country}_clean.csv"
-    if file_path.exists():
-        return pd.read_csv(file_path, parse_dates=["Timestamp"])
-    return pd.DataFrame()
-
-def load_all_countries(data_dir: Path) -> pd.DataFrame:
-    dfs = []
-    for file in data_dir.glob("*_clean.csv"):
-        country = file.stem.replace("_clean", "").capitalize()
-        df = pd.read_csv(file, parse_dates=["Timestamp"])
-        df["Country"] = country
-        dfs.append(df)
-    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
-
+    return list(_country_files(data_dir))
+
+def _usecols(columns: list | None):
+    # Timestamp is always kept; columns missing from a file are skipped rather than raising
+    if columns is None:
+        return None
+    wanted = set(columns) | {"Timestamp"}
+    return lambda col: col in wanted
+
+def _parquet_columns(file_path: Path, columns: list | None) -> list | None:
+    if columns is None:
+        return None
+    keep = _usecols(columns)
+    return [c for c in pq.read_schema(file_path).names if keep(c)]
+
+def _csv_dtypes(file_path: Path, categorical: bool = True) -> dict:
+    header = pd.read_csv(file_path, nrows=0).columns
+    dtypes = {c: "float32" for c in _FLOAT32_COLS if c in header}
+    if categorical:
+        dtypes.update({c: "category" for c in CATEGORICAL_COLS if c in header})
+    return dtypes
+
+def _read_country_file(file_path: Path, columns: list | None = None, categorical: bool = True) -> pd.DataFrame:
+    if file_path.suffix == ".parquet":
+        # Already cleaned and typed; only the categorical casts are applied here
+        df = pd.read_parquet(file_path, engine="pyarrow", columns=_parquet_columns(file_path, columns))
+        if categorical:
+            cats = [c for c in CATEGORICAL_COLS if c in df.columns]
+            df[cats] = df[cats].astype("category")
+        return df
+    return pd.read_csv(file_path, usecols=_usecols(columns), parse_dates=["Timestamp"],
+                       dtype=_csv_dtypes(file_path, categorical))
+
+@st.cache_data(show_spinner="Loading solar data…", ttl=3600, max_entries=8)
+def load_clean_data(data_dir: Path, country: str, columns: list | None = None) -> pd.DataFrame:
+    file_path = _country_files(data_dir).get(country)
+    if file_path is None:
+        return pd.DataFrame()
+    df = _read_country_file(file_path, columns)
+    # Sorted once here so the pages never sort per rerun
+    if not df["Timestamp"].is_monotonic_increasing:
+        df.sort_values("Timestamp", inplace=True, kind="mergesort")
+        df.reset_index(drop=True, inplace=True)
+    return df
+
+def read_country_files(data_dir: Path, columns: list | None = None) -> pd.DataFrame:
+    files = _country_files(data_dir)
+    # Shared categorical dtype so concat keeps Country as int8 codes
+    countries = pd.CategoricalDtype([country.capitalize() for country in files])
+    if not files:
+        return pd.DataFrame()
+
+    def read_one(i: int, file: Path) -> pd.DataFrame:
+        # Per-file categories would not survive concat, so only the float32 downcast applies here
+        df = _read_country_file(file, columns, categorical=False)
+        df["Country"] = pd.Categorical.from_codes(np.full(len(df), i, dtype=np.int8), dtype=countries)
+        return df
+
+    # The CSV and Parquet readers release the GIL while parsing, so files are read concurrently
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as ex:
+        dfs = list(ex.map(read_one, range(len(files)), files.values()))
+    return pd.concat(dfs, ignore_index=True)
+
+@st.cache_data(show_spinner="Loading solar data…", ttl=3600, max_entries=8)
+def load_all_countries(data_dir: Path, columns: list | None = None) -> pd.DataFrame:
+    parquet_path = data_dir / PARQUET_FILE
+    country_files = _country_files(data_dir).values()
+    # Only trust the combined file if it is at least as new as every per-country file
+    newest = max((f.stat().st_mtime for f in country_files), default=0.0)
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= newest:
+        columns = _parquet_columns(parquet_path, columns + ["Country"] if columns is not None else None)
+        return pd.read_parquet(parquet_path, engine="pyarrow", columns=columns)
+    return read_country_files(data_dir, columns)
+
+
+def _df_fingerprint(d: pd.DataFrame) -> tuple:
+    # Cheap cache key: st.cache_data hands back a fresh copy per rerun, so id(df) would never hit
+    return (d.shape, tuple(d.columns), d["Timestamp"].iloc[0], d["Timestamp"].iloc[-1])
+
+@st.cache_data(hash_funcs={pd.DataFrame: _df_fingerprint}, ttl=3600)
+def resample_series(df: pd.DataFrame, country: str, column: str = "GHI", rule: str = "30min") -> pd.Series:
+    # country is part of the cache key since the DataFrame fingerprint only looks at shape and time span
+    return df.set_index("Timestamp")[column].resample(rule).mean().dropna()
 
 
 def generate_summary(df: pd.DataFrame, metrics: list) -> pd.DataFrame:
-    return df.groupby("Country")[metrics].agg(["mean", "median", "std"]).round(2)
-
-
+    return (
+        df[metrics].astype("float64")
+        .groupby(df["Country"], observed=True, sort=False)
+        .agg(["mean", "median", "std"])
+        .round(2)
+    )
+
+
+@st.cache_data
+def full_summary(df_all: pd.DataFrame) -> pd.DataFrame:
+    # One aggregation over every numeric column; pages slice it per metric with .xs.
+    # Sensor columns are stored as float32, so aggregate in float64 to keep rounded values exact
+    num = df_all.select_dtypes("number").columns
+    return (
+        df_all[num].astype("float64")
+        .groupby(df_all["Country"], observed=True, sort=False)
+        .agg(["count", "mean", "std", "min", "max"])
+        .rename(columns={"count": "Count", "mean": "Mean", "std": "StdDev", "min": "Min", "max": "Max"}, level=1)
+        .round(2)
+    )
+
+@st.cache_data
+def country_means(df_all: pd.DataFrame) -> pd.DataFrame:
+    num = df_all.select_dtypes("number").columns
+    return df_all[num].astype("float64").groupby(df_all["Country"], observed=True, sort=False).mean()
+
+
+# Figures are built with the object-oriented API (no pyplot state, nothing left open in
+# pyplot's figure manager). Each call returns a new Figure; only rendered bytes are cached.
 def plot_country_ranking(df: pd.DataFrame, metric: str, ascending=False):
-    avg_df = df.groupby("Country")[metric].mean().reset_index()
+    avg_df = country_means(df)[metric].reset_index()
     avg_df.sort_values(metric, ascending=ascending, inplace=True)
-    fig, ax = plt.subplots(figsize=(10, 5))
+    # Plain strings so seaborn draws bars in rank order, not category order
+    avg_df["Country"] = avg_df["Country"].astype(str)
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
     sns.barplot(data=avg_df, y="Country", x=metric, palette="viridis" if not ascending else "magma", ax=ax)
     ax.set_title(f"{metric} Ranking by Country")
     ax.set_xlabel(f"Average {metric}")
@@ -41,14 +157,47 @@ def plot_country_ranking(df: pd.DataFrame, metric: str, ascending=False):
     return fig
 
 def plot_metric_boxplot(df: pd.DataFrame, metric: str):
-    fig, ax = plt.subplots(figsize=(10, 5))
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
     sns.boxplot(data=df, x="Country", y=metric, palette="Set2", ax=ax)
     ax.set_title(f"{metric} Distribution by Country")
     return fig
 
 
+def _figure_png(fig: Figure, dpi: int = 90) -> bytes:
+    # The Figure is discarded once encoded; only the bytes are kept in the cache
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+    fig.clear()
+    return buf.getvalue()
+
+# Encoded PNGs are what the comparison page sends; on a cache hit Streamlit just resends the bytes.
+# The key ignores values, so entries expire with the loaders' ttl to pick up rebuilt data.
+@st.cache_data(hash_funcs={pd.DataFrame: _df_fingerprint}, ttl=3600, max_entries=32)
+def rendered_ranking_png(df: pd.DataFrame, metric: str, ascending=False) -> bytes:
+    return _figure_png(plot_country_ranking(df, metric, ascending))
+
+@st.cache_data(hash_funcs={pd.DataFrame: _df_fingerprint}, ttl=3600, max_entries=32)
+def rendered_boxplot_png(df: pd.DataFrame, metric: str) -> bytes:
+    return _figure_png(plot_metric_boxplot(df, metric))
+
+
+@st.cache_data
+def _grouped_arrays(df: pd.DataFrame, metric: str) -> list:
+    # Split the metric into one contiguous float64 array per country without a Python groupby loop
+    country = df["Country"].astype("category")
+    codes = country.cat.codes.to_numpy()
+    vals = df[metric].to_numpy(dtype=np.float64)
+    mask = ~np.isnan(vals) & (codes >= 0)
+    codes, vals = codes[mask], vals[mask]
+    order = np.argsort(codes, kind="stable")
+    codes, vals = codes[order], vals[order]
+    splits = np.searchsorted(codes, np.arange(len(country.cat.categories) + 1))
+    groups = [vals[splits[i]:splits[i + 1]] for i in range(len(splits) - 1)]
+    return [g for g in groups if g.size]
+
 def run_statistical_tests(df: pd.DataFrame, metric: str) -> dict:
-    groups = [group[metric].dropna() for _, group in df.groupby("Country") if metric in group.columns]
+    groups = _grouped_arrays(df, metric) if metric in df.columns else []
     if len(groups) < 2:
         return {"error": "Not enough groups for statistical testing."}
     try:
@@ -70,7 +219,7 @@ class ComparisonManager:
         return generate_summary(self.df_all, self.metrics)
 
     def ranking(self, metric="GHI", ascending=False):
-        return self.df_all.groupby("Country")[metric].mean().sort_values(ascending=ascending)
+        return country_means(self.df_all)[metric].sort_values(ascending=ascending)
 
     def plot_ranking(self, metric="GHI", ascending=False):
         return plot_country_ranking(self.df_all, metric, ascending)
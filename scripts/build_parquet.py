@@ -0,0 +1,31 @@
+"""
+build_parquet.py
+Concatenates every data/<country>_clean.{parquet,csv} into a single
+Parquet file that the dashboard loads instead of reading each country.
+
+Usage (from the project root):
+    python -m scripts.build_parquet
+"""
+
+from pathlib import Path
+
+from app.utils import DATA_DIR, PARQUET_FILE, _FLOAT32_COLS, read_country_files
+
+
+def build_parquet(data_dir: Path = DATA_DIR) -> Path:
+    df = read_country_files(data_dir)
+    if df.empty:
+        raise FileNotFoundError(f"No *_clean.parquet or *_clean.csv files found in {data_dir}")
+
+    # Same downcast as the per-country loaders, so both load paths return identical dtypes
+    float_cols = [c for c in _FLOAT32_COLS if c in df.columns]
+    df[float_cols] = df[float_cols].astype("float32")
+
+    out_path = data_dir / PARQUET_FILE
+    df.to_parquet(out_path, engine="pyarrow", compression="zstd", row_group_size=200_000)
+    return out_path
+
+
+if __name__ == "__main__":
+    path = build_parquet()
+    print(f"✅ Wrote {path}")
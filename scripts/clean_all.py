@@ -0,0 +1,38 @@
+"""
+clean_all.py
+Runs SolarCleaner over every raw country CSV once and writes the result as
+data/<country>_clean.parquet, so the dashboard never has to clean or
+re-parse CSVs at runtime.
+
+Usage (from the project root):
+    python -m scripts.clean_all
+"""
+
+from pathlib import Path
+
+from app.utils import DATA_DIR, _FLOAT32_COLS
+from src.solar_eda import SolarCleaner, load_raw
+
+RAW_DIR = DATA_DIR / "raw"
+
+
+def clean_all(raw_dir: Path = RAW_DIR, out_dir: Path = DATA_DIR) -> list[Path]:
+    cleaner = SolarCleaner()
+    written = []
+    for raw_path in sorted(raw_dir.glob("*.csv")):
+        df = cleaner.clean(load_raw(raw_path))
+        float_cols = [c for c in _FLOAT32_COLS if c in df.columns]
+        df[float_cols] = df[float_cols].astype("float32")
+
+        out_path = out_dir / f"{raw_path.stem}_clean.parquet"
+        df.to_parquet(out_path, engine="pyarrow", compression="zstd", index=False)
+        written.append(out_path)
+    return written
+
+
+if __name__ == "__main__":
+    paths = clean_all()
+    if not paths:
+        print(f"⚠️ No raw CSV files found in {RAW_DIR}")
+    for path in paths:
+        print(f"✅ Wrote {path}")
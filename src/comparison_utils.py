@@ -1,4 +1,5 @@
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -12,8 +13,10 @@ class ComparisonManager:
         self.metrics = metrics or ["GHI", "DNI", "DHI"]
         self.data = {}
         self.summary = None
+        self._combined = None
 
     def load_data(self):
+        self._combined = None
         for country in self.countries:
             file_path = self.data_dir / f"{country}_clean.csv"
             try:
@@ -24,25 +27,45 @@ class ComparisonManager:
             except pd.errors.ParserError:
                 print(f"⚠️ Parsing error: {file_path}")
     
+    def _combined_metrics(self, metrics):
+        """
+        Returns all countries' values for `metrics` as one frame with a categorical Country
+        column. Built once from the metric columns only and extended when new metrics are asked for.
+        """
+        missing = [m for m in metrics if self._combined is None or m not in self._combined.columns]
+        if not missing:
+            return self._combined
+        for country, df in self.data.items():
+            absent = [m for m in missing if m not in df.columns]
+            if absent:
+                raise KeyError(f"{absent} not found in {country} data")
+
+        # Stack only the metric columns instead of concatenating every column of every country
+        blocks = [df[missing].to_numpy(dtype=np.float64) for df in self.data.values()]
+        stacked = pd.DataFrame(np.vstack(blocks), columns=missing)
+        if self._combined is None:
+            codes = np.repeat(np.arange(len(blocks), dtype=np.int16), [len(b) for b in blocks])
+            stacked["Country"] = pd.Categorical.from_codes(codes, [c.capitalize() for c in self.data])
+            self._combined = stacked
+        else:
+            self._combined[missing] = stacked
+        return self._combined
+
     def generate_summary_table(self):
-        combined = pd.concat([
-            df.assign(Country=country.capitalize()) 
-            for country, df in self.data.items()
-        ])
-        summary = combined.groupby("Country")[self.metrics].agg(["mean", "median", "std"]).round(2)
+        combined = self._combined_metrics(self.metrics)
+        summary = combined.groupby("Country", observed=True)[self.metrics].agg(["mean", "median", "std"]).round(2)
         return summary
     
     def generate_country_ranking(self, metric="GHI", ascending=False, plot=True):
-        ranking_data = []
-        for country, df in self.data.items():
-            if metric in df.columns:
-                ranking_data.append({
-                    "Country": country.capitalize(),
-                    f"Mean {metric}": df[metric].mean()
-                })
-        ranking_df = pd.DataFrame(ranking_data)
-        ranking_df.sort_values(by=f"Mean {metric}", ascending=ascending, inplace=True)
-        ranking_df.reset_index(drop=True, inplace=True)
+        combined = self._combined_metrics([metric])
+        ranking_df = (
+            combined.groupby("Country", observed=True, sort=False)[metric]
+            .mean()
+            .sort_values(ascending=ascending)
+            .reset_index(name=f"Mean {metric}")
+        )
+        # Plain strings, as before, so the bar plot follows rank order instead of category order
+        ranking_df["Country"] = ranking_df["Country"].astype(str)
         ranking_df.index += 1  # start ranks from 1
         ranking_df.insert(0, "Rank", ranking_df.index)
 
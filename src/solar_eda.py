@@ -3,18 +3,78 @@ solar_eda.py
 Reusable EDA & cleaning module for solar datasets.
 """
 
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from scipy.stats import zscore
 from windrose import WindroseAxes
 
 # Constants
 _ZCOLS = ['GHI', 'DNI', 'DHI', 'ModA', 'ModB', 'WS', 'WSgust']
 _KEYCOLS = _ZCOLS + ['Tamb', 'RH']
 
+# Optional: numba fuses the z-score reduction into one parallel pass; numpy is used without it
+try:
+    from numba import njit, prange
+except ImportError:
+    _zmask = None
+else:
+    # No fastmath: it would let numba drop the v == v NaN checks
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def _zmask(a, thr):
+        n, k = a.shape
+        mu = np.empty(k)
+        sd = np.empty(k)
+        for j in range(k):
+            s = 0.0
+            c = 0
+            for i in range(n):
+                v = a[i, j]
+                if v == v:
+                    s += v
+                    c += 1
+            mu[j] = s / c
+            s2 = 0.0
+            for i in range(n):
+                v = a[i, j]
+                if v == v:
+                    s2 += (v - mu[j]) ** 2
+            sd[j] = (s2 / c) ** 0.5
+        mask = np.zeros(n, np.bool_)
+        for i in prange(n):
+            for j in range(k):
+                v = a[i, j]
+                if v == v and abs((v - mu[j]) / sd[j]) > thr:
+                    mask[i] = True
+                    break
+        return mask
+
+# Correlation matrices keyed on (cols, row count, content hash), so in-place edits miss the cache
+_CORR_CACHE: OrderedDict = OrderedDict()
+_CORR_CACHE_SIZE = 16
+
+def _corr(df: pd.DataFrame, cols: tuple) -> pd.DataFrame:
+    sub = df[list(cols)]
+    key = (cols, len(sub), int(pd.util.hash_pandas_object(sub, index=False).sum()))
+    if key in _CORR_CACHE:
+        _CORR_CACHE.move_to_end(key)
+        return _CORR_CACHE[key].copy()
+
+    a = sub.to_numpy(dtype=np.float64)
+    if np.isnan(a).any():
+        # Pairwise-complete correlation only pandas handles correctly
+        corr = sub.corr()
+    else:
+        corr = pd.DataFrame(np.corrcoef(a, rowvar=False), index=cols, columns=cols)
+
+    _CORR_CACHE[key] = corr
+    if len(_CORR_CACHE) > _CORR_CACHE_SIZE:
+        _CORR_CACHE.popitem(last=False)
+    return corr.copy()
+
 class SolarCleaner:
     def __init__(self, z_thresh: float = 3.0, impute: bool = True, add_features: bool = True):
         self.z_thresh = z_thresh
@@ -33,15 +93,17 @@ class SolarCleaner:
         if cols is None:
             cols = df.select_dtypes(include=[np.number]).columns
 
-        neg_counts = (df[cols] < 0).sum()
-        zero_counts = (df[cols] == 0).sum()
-        pos_counts = (df[cols] > 0).sum()
+        a = df[cols].to_numpy(dtype=np.float64)
+        pos_counts = np.count_nonzero(a > 0, axis=0)
+        neg_counts = np.count_nonzero(a < 0, axis=0)
+        # Zeros are whatever is left once positives, negatives and NaNs are taken out
+        zero_counts = a.shape[0] - pos_counts - neg_counts - np.count_nonzero(np.isnan(a), axis=0)
 
         summary_df = pd.DataFrame({
             'Negative': neg_counts,
             'Zero': zero_counts,
             'Positive': pos_counts
-        }).sort_index()
+        }, index=list(cols)).sort_index()
 
         # Drop columns with no data in any category
         summary_df = summary_df[(summary_df[['Negative', 'Zero', 'Positive']].sum(axis=1) > 0)]
@@ -58,8 +120,7 @@ class SolarCleaner:
     
     def clean(self, df: pd.DataFrame) -> pd.DataFrame:
         df = self._drop_empty_columns(df.copy())
-        df = self._zero_night_negatives(df)
-        df = self._fix_daytime_negatives(df)
+        df = self._fix_negatives(df)
         df, _ = self._clip_outliers(df)
         if self.impute:
             df = self._impute_median(df)
@@ -73,48 +134,38 @@ class SolarCleaner:
             print(f"Dropping columns: {list(to_drop)}")
         return df.drop(columns=to_drop)
 
-    def _zero_night_negatives(self, df: pd.DataFrame, irr_cols=_ZCOLS[:3], threshold: float = 1.0) -> pd.DataFrame:
-        night = (df[irr_cols] < threshold).all(axis=1)
-        neg = (df[irr_cols] < 0).any(axis=1)
-        fix = night & neg
-        df.loc[fix, irr_cols] = df.loc[fix, irr_cols].clip(lower=0)
-        return df
-    
-    def _fix_daytime_negatives(self, df: pd.DataFrame, irr_cols=_ZCOLS[:3], threshold: float = 1.0) -> pd.DataFrame:
+    def _fix_negatives(self, df: pd.DataFrame, irr_cols=_ZCOLS[:3]) -> pd.DataFrame:
         """
-        Sets negative irradiance values (GHI, DNI, DHI) to 0 if they occur during daytime.
-        
+        Sets negative irradiance values (GHI, DNI, DHI) to 0, day or night.
+
         Parameters:
-            df: DataFrame with irradiance data and 'Hour' column.
-            irr_cols: List of irradiance columns to check (default: ['GHI', 'DNI', 'DHI']).
-            threshold: Minimum value to consider it "daytime" (e.g., GHI > 1).
-        
+            df: DataFrame with irradiance data.
+            irr_cols: List of irradiance columns to clip (default: ['GHI', 'DNI', 'DHI']).
+
         Returns:
             Cleaned DataFrame.
         """
         if 'Hour' not in df.columns:
             df['Hour'] = df['Timestamp'].dt.hour
 
-        # Define daytime: any irradiance value above threshold
-        is_daytime = (df[irr_cols] > threshold).any(axis=1)
-
-        # Find negative values during daytime
-        day_neg = is_daytime & (df[irr_cols] < 0).any(axis=1)
-
-        # Set negatives to zero only in those rows
-        df.loc[day_neg, irr_cols] = df.loc[day_neg, irr_cols].clip(lower=0)
-
+        # Irradiance can't be negative, so night and daytime readings are clipped in one pass
+        df[irr_cols] = df[irr_cols].clip(lower=0)
         return df
 
     def _clip_outliers(self, df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
-        z = df[_ZCOLS].apply(zscore, nan_policy='omit')
-        mask = (np.abs(z) > self.z_thresh).any(axis=1)
+        a = df[_ZCOLS].to_numpy(dtype=np.float32)
+        if _zmask is not None:
+            mask = _zmask(a, self.z_thresh)
+        else:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                z = np.abs((a - np.nanmean(a, axis=0)) / np.nanstd(a, axis=0))
+            # NaN z-scores compare False, matching zscore(nan_policy='omit')
+            mask = (z > self.z_thresh).any(axis=1)
         return df.loc[~mask].copy(), int(mask.sum())
 
     def _impute_median(self, df: pd.DataFrame) -> pd.DataFrame:
-        for col in _KEYCOLS:
-            if col in df.columns:
-                df[col] = df[col].fillna(df[col].median())
+        cols = [c for c in _KEYCOLS if c in df.columns]
+        df[cols] = df[cols].fillna(df[cols].median(numeric_only=True))
         return df
 
     def _engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -172,7 +223,7 @@ class SolarEDA:
             cols = df.select_dtypes(include=[np.number]).columns
         if cols is None:
             cols = df.select_dtypes(include=[np.number]).columns
-        corr = df[cols].corr()
+        corr = _corr(df, tuple(cols))
         ax = sns.heatmap(corr, annot=True, cmap='coolwarm', vmin=-1, vmax=1, square=True)
         ax.set_title("Correlation Matrix")
         return ax    
@@ -235,7 +286,9 @@ class SolarEDA:
                         title: str | None = None) -> plt.Axes:
         if size_col not in df.columns:
             raise KeyError(f"{size_col} not in dataframe")
-        sample = df.sample(min(len(df), n), random_state=42)
+        # Evenly strided subset: a visual sample only, no need for a full permutation
+        step = max(1, len(df) // n)
+        sample = df.iloc[:step * n:step][list(dict.fromkeys(["GHI", "Tamb", size_col]))]
         fig, ax = plt.subplots(figsize=(8, 5))
         sc = ax.scatter(sample["GHI"], sample["Tamb"],
                         s=sample[size_col] * size_scale,